@@ -1,7 +1,12 @@
-from flask import Flask, request, jsonify, g
+from flask import Flask, request, jsonify, g, Response, stream_with_context
 import sqlite3
 import logging
 import os
+import queue
+import threading
+import time
+from functools import wraps
+from urllib.parse import quote
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -11,57 +16,160 @@ app = Flask(__name__)
 
 DB_FILE = "database/exercise.db"
 TEST_DB_FILE = "database/test.db"
+# Stored in the database's user_version once schema.sql has been applied;
+# bump it whenever schema.sql changes so existing databases pick it up
+SCHEMA_VERSION = 1
+# Used for app.config["DATABASE"] = ":memory:"; it lives as long as a pooled
+# connection to it stays open
+MEMORY_DATABASE_URI = "file::memory:?cache=shared"
+DB_POOL_SIZE = 8
+DB_CACHED_STATEMENTS = 256
+CACHE_TTL = 60
+CACHE_MAX_ENTRIES = 1024
+STREAM_MIN_SIZE = 100
+MAX_PAGE_SIZE = 200
+MAX_OFFSET = 10000
+
+# Applied once to every new connection: WAL lets readers run alongside a
+# writer, and busy_timeout makes writers wait for the lock instead of failing
+# straight away with "database is locked". WAL is persistent in the database
+# file, so only read-write connections (which may switch it on) set it.
+DB_WAL_PRAGMA = "PRAGMA journal_mode=WAL;"
+DB_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=5000;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+"""
+
+# Process-wide pools of open connections, reused across requests instead of
+# reconnecting every time. Connections are created lazily on first use.
+# Read-only connections serve GET handlers so they never touch the write side.
+_rw_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_ro_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+def _database_uri(readonly=False):
+    '''
+        Returns the URI of the configured SQLite database, read-only if requested.
+    '''
+    # app.config["DATABASE"] overrides the default database file
+    database = app.config.get("DATABASE")
+    if not database:
+        database = TEST_DB_FILE if app.config.get("TESTING") else DB_FILE  # Use test db DB for tests
+
+    # A private :memory: database would give every pooled connection its own
+    # empty database, so share one in-memory database between them instead
+    if database == ":memory:":
+        database = MEMORY_DATABASE_URI
+
+    # Already a URI, e.g. a shared in-memory database: there is no file to
+    # reopen read-only, so it is used as given
+    if database.startswith("file:"):
+        return database
 
-def get_db():
+    return f"file:{quote(database)}?mode={'ro' if readonly else 'rwc'}"
+
+def _connect(readonly=False):
     '''
-        Returns a connection to the SQLite database.
+        Opens a new connection to the SQLite database for the pool.
     '''
-    # Get the database connection from the Flask application context
+    # Autocommit mode: every statement commits on its own
+    db = sqlite3.connect(
+        _database_uri(readonly),
+        uri=True,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=DB_CACHED_STATEMENTS,
+    )
+    db.row_factory = sqlite3.Row
+    if not readonly:
+        db.execute(DB_WAL_PRAGMA)
+    db.executescript(DB_PRAGMAS)
+
+    return db
+
+def get_db(readonly=False):
+    '''
+        Returns a connection to the SQLite database, read-only if requested.
+    '''
+    # Check out a pooled connection once per application context
     if "_database" not in g:
-        if app.config.get("TESTING"):
-            g._database = sqlite3.connect(TEST_DB_FILE)  # Use test db DB for tests
-        else:
-            g._database = sqlite3.connect(DB_FILE)
+        pool = _ro_pool if readonly else _rw_pool
+        try:
+            g._database = pool.get_nowait()
+        except queue.Empty:
+            g._database = _connect(readonly)
 
-        g._database.row_factory = sqlite3.Row
+        g._readonly = readonly
 
     return g._database
 
+def close_pool():
+    '''
+        Closes every idle pooled connection, e.g. before switching databases.
+    '''
+    for pool in (_rw_pool, _ro_pool):
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
 def init_db():
     '''
         Initialize database and create necessary tables
     '''
     with app.app_context():
-        # Gets the database connection
+        # Gets the database connection (a read-write one, which also switches
+        # the database to WAL before any request is served)
         db = get_db()
+
+        # Skip the schema script when this version of it was already applied
+        if db.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            logger.debug("db schema up to date")
+            return
+
         # Execute the content in schema.sql file to create tables
         with app.open_resource('schema.sql', mode='r') as f:
             db.cursor().executescript(f.read())
-        
-        db.commit()
-        logger.debug(f"db initialization done")
 
-# Function to run before each request
-@app.before_request
-def before_request():
-    '''
-        Ensure database connection is available
-    '''
-    # Get the database connection and store it in the Flask application context
-    g._database = get_db()  
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        logger.debug("db initialization done")
 
-#Function to run after each request
-@app.teardown_request
+#Function to run when the application context ends (after each request)
+@app.teardown_appcontext
 def close_connection(exception):
     '''
-        to ensure the database connection is closed properly
-    '''    
+        to ensure the database connection is returned to the pool
+    '''
+    # A streamed response is still reading from the connection; the context
+    # is torn down again once the stream ends
+    if g.get('_streaming'):
+        return
+
     # Get the database connection from the Flask application context
-    db = getattr(g, '_database', None)  
-    # Close the database connection if it exists
-    if db is not None:
-        db.close()  
-        logger.debug(f"db connection closed")
+    db = g.pop('_database', None)
+    if db is None:
+        return
+
+    _release_connection(db, g.pop('_readonly', False))
+
+def _release_connection(db, readonly):
+    '''
+        Puts a checked-out connection back in its pool, or closes it if the pool is full.
+    '''
+    pool = _ro_pool if readonly else _rw_pool
+
+    # Never hand out a connection with a half-finished transaction
+    if db.in_transaction:
+        db.rollback()
+
+    try:
+        pool.put_nowait(db)
+        logger.debug("db connection returned to pool")
+    except queue.Full:
+        db.close()
+        logger.debug("db connection closed")
 
 # Global error handler
 @app.errorhandler(404)
@@ -76,8 +184,145 @@ def bad_request(error):
 def internal_error(error):
     return jsonify({"error": "Internal server error", "message": "An unexpected error occurred"}), 500
 
+# In-process cache of GET responses: {table: {request path: (timestamp, body, status)}}
+_cache = {}
+_cache_lock = threading.Lock()
+# The cache's clock, a module attribute so tests can replace it on its own
+_now = time.monotonic
+
+def cached(table, ttl=CACHE_TTL):
+    '''
+        Serves a GET handler's response from memory until ttl seconds pass
+        or a write to table invalidates it. Disabled in testing mode.
+    '''
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if app.config.get("TESTING"):
+                return view(*args, **kwargs)
+
+            key = request.full_path
+            with _cache_lock:
+                entries = _cache.setdefault(table, {})
+                entry = entries.get(key)
+
+            if entry is not None and _now() - entry[0] < ttl:
+                return app.response_class(entry[1], status=entry[2], mimetype="application/json")
+
+            response = app.make_response(view(*args, **kwargs))
+
+            # Stored in the dict captured above, so a response computed while a
+            # write invalidated the table is dropped together with that dict
+            with _cache_lock:
+                if len(entries) >= CACHE_MAX_ENTRIES:
+                    entries.clear()
+                entries[key] = (_now(), response.get_data(), response.status_code)
+
+            return response
+        return wrapper
+    return decorator
+
+def _invalidate(table):
+    '''
+        Drops every cached response that was read from table.
+    '''
+    with _cache_lock:
+        _cache.pop(table, None)
+
+# Writers in this process take turns instead of racing for SQLite's write
+# lock; readers never take it. busy_timeout still covers other processes.
+_write_lock = threading.Lock()
+
+def write_locked(view):
+    '''
+        Runs a handler that writes to the database while holding the write lock,
+        so its checks and the write that depends on them cannot interleave with
+        another writer.
+    '''
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Read the whole body first: the handler's get_json() then parses the
+        # cached bytes, so a client that is slow to send its body never holds
+        # up other writers
+        request.get_data()
+        with _write_lock:
+            return view(*args, **kwargs)
+    return wrapper
+
+def _find_duplicate(cursor, query, keys):
+    '''
+        Returns the index of the first key that repeats an earlier key or
+        already matches a row for query, or None if there is none.
+    '''
+    seen = set()
+    for index, key in enumerate(keys):
+        if key in seen or cursor.execute(query, key).fetchone():
+            return index
+        seen.add(key)
+
+    return None
+
+# SQL statements used by the handlers. Keeping them as constants means every
+# request passes the same text, so sqlite3's per-connection statement cache
+# hands back the already compiled statement instead of parsing it again.
+PROJECT_COLUMNS = ("id", "code", "archived", "start_date", "end_date")
+
+INSERT_PROJECT = "INSERT INTO projects (code, archived, start_date, end_date) VALUES (?, ?, ?, ?)"
+SELECT_PROJECT_EXISTS = "SELECT 1 FROM projects WHERE code = ?"
+SELECT_PROJECT_BY_CODE = "SELECT code, archived, start_date, end_date FROM projects WHERE code = ?"
+# Deletes only when nothing is associated; RETURNING tells whether it did
+DELETE_PROJECT = """
+    DELETE FROM projects
+    WHERE code = ? AND NOT EXISTS (
+        SELECT 1 FROM project_software WHERE project_id = projects.id
+    )
+    RETURNING id
+"""
+
+INSERT_SOFTWARE = "INSERT INTO software (name, version, vendor, deprecated) VALUES (?, ?, ?, ?)"
+SELECT_SOFTWARE_EXISTS = "SELECT 1 FROM software WHERE name = ? AND version = ?"
+SELECT_SOFTWARE_BY_NAME = "SELECT name, version, vendor, deprecated FROM software WHERE name = ?"
+DELETE_SOFTWARE = """
+    DELETE FROM software
+    WHERE name = ? AND version = ? AND NOT EXISTS (
+        SELECT 1 FROM project_software WHERE software_id = software.id
+    )
+    RETURNING id
+"""
+
+# Everything associate_software_with_project checks, in one round trip. The
+# LEFT JOINs always yield a single row, with NULL ids when the project or the
+# software does not exist. The major version is the text before the first dot.
+SELECT_ASSOCIATION_STATE = """
+    WITH p AS (SELECT id FROM projects WHERE code = ?),
+         s AS (SELECT id, deprecated FROM software WHERE name = ? AND version = ?)
+    SELECT
+        p.id AS project_id,
+        s.id AS software_id,
+        s.deprecated AS deprecated,
+        EXISTS (
+            SELECT 1
+            FROM project_software
+            WHERE project_id = p.id AND software_id = s.id
+        ) AS associated,
+        (
+            SELECT s2.version
+            FROM software s2
+            JOIN project_software ps
+            ON s2.id = ps.software_id
+            WHERE s2.deprecated = 0 AND ps.project_id = p.id AND s2.name = ?
+            AND substr(s2.version, 1, instr(s2.version || '.', '.') - 1) != ?
+            LIMIT 1
+        ) AS conflicting_version
+    FROM (SELECT 1)
+    LEFT JOIN p
+    LEFT JOIN s
+"""
+INSERT_PROJECT_SOFTWARE = "INSERT INTO project_software (project_id, software_id) VALUES (?, ?)"
+
 # CRUD APIs for Projects
 @app.route("/projects", methods=["POST"])
+@write_locked
 def create_project():
     data = request.get_json()
     
@@ -93,53 +338,141 @@ def create_project():
 
     try:
         cursor.execute(
-            "INSERT INTO projects (code, archived, start_date, end_date) VALUES (?, ?, ?, ?)",
+            INSERT_PROJECT,
             (data["code"], data.get("archived", 0), data.get("start_date"), data.get("end_date")),
         )
-        db.commit()
         
         project_id = cursor.lastrowid
-        logger.info(f"Project created: {data['code']} (ID: {project_id})") 
+        _invalidate("projects")
+        logger.info("Project created: %s (ID: %s)", data['code'], project_id)
         return jsonify({"message": "Project created successfully", "id": project_id}), 201
 
     except sqlite3.IntegrityError:
-        logger.warning(f"Project creation failed: Code {data['code']} already exists")
+        logger.warning("Project creation failed: Code %s already exists", data['code'])
         return jsonify({"error": f"Project with code {data['code']} already exists"}), 400
     except sqlite3.Error as e:
-        logger.error(f"Database error during project creation: {e}")
+        logger.error("Database error during project creation: %s", e)
+        return jsonify({"error": "Internal Server Error"}), 500
+
+# Creates many projects in one transaction
+@app.route("/projects/bulk", methods=["POST"])
+@write_locked
+def create_projects_bulk():
+    data = request.get_json()
+
+    if not data or not isinstance(data, list):
+        return jsonify({"error": "A list of projects is required"}), 400
+
+    for index, project in enumerate(data):
+        if not isinstance(project, dict) or project.get("code") is None:
+            return jsonify({"error": "Project code is required", "index": index}), 400
+
+        # projects is STRICT, so anything but an integer fails the whole batch
+        if not isinstance(project.get("archived", 0), int):
+            return jsonify({"error": "archived must be an integer", "index": index}), 400
+
+    rows = [(d["code"], d.get("archived", 0), d.get("start_date"), d.get("end_date")) for d in data]
+
+    db = get_db()
+    cursor = db.cursor()
+
+    try:
+        # One savepoint for the whole batch: a single commit, and no rows kept if any fails
+        cursor.execute("SAVEPOINT bulk_insert")
+        try:
+            cursor.executemany(INSERT_PROJECT, rows)
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO bulk_insert")
+            raise
+        finally:
+            cursor.execute("RELEASE bulk_insert")
+
+        _invalidate("projects")
+        logger.info("Projects created: %s", len(rows))
+        return jsonify({"message": "Projects created successfully", "count": len(rows)}), 201
+
+    except sqlite3.IntegrityError as e:
+        index = _find_duplicate(cursor, SELECT_PROJECT_EXISTS, [(row[0],) for row in rows])
+        if index is None:
+            logger.warning("Bulk project creation failed: %s", e)
+            return jsonify({"error": "Projects violate a database constraint"}), 400
+
+        code = rows[index][0]
+        logger.warning("Bulk project creation failed: Code %s already exists", code)
+        return jsonify({"error": f"Project with code {code} already exists", "index": index}), 400
+    except sqlite3.Error as e:
+        logger.error("Database error during bulk project creation: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
 
 @app.route("/projects/<string:code>", methods=["GET"])
+@cached("projects")
 def get_project_by_code(code):
-    logger.info(f"Searching projects by code: {code}")
+    logger.debug("Searching projects by code: %s", code)
 
-    db = get_db()
+    db = get_db(readonly=True)
     cursor = db.cursor()
-    
-    query = "SELECT code, archived, start_date, end_date FROM projects WHERE code = ?"
 
-    cursor.execute(query, (code,))
+    cursor.execute(SELECT_PROJECT_BY_CODE, (code,))
     project = cursor.fetchone()
 
     if project is None:
         return jsonify({"error": "Project not found"}), 404
 
     # Convert row to dictionary
-    project_dict = dict(zip([column[0] for column in cursor.description], project))
+    project_dict = dict(project)
 
     return jsonify(project_dict)
 
+def _stream_projects(rows, trailer):
+    '''
+        Returns a response that writes a {"projects": [...], ...} JSON body one
+        project at a time, straight from rows. trailer(count, last_row) returns
+        the fields written after the list.
+    '''
+    started = False
+
+    def generate():
+        nonlocal started
+        started = True
+        try:
+            yield '{"projects": ['
+
+            count = 0
+            last_row = None
+            for row in rows:
+                yield (", " if count else "") + app.json.dumps(dict(zip(PROJECT_COLUMNS, row)))
+                count += 1
+                last_row = row
+
+            fields = trailer(count, last_row)
+            yield "], " + ", ".join(f"{app.json.dumps(key)}: {app.json.dumps(value)}" for key, value in fields.items()) + "}\n"
+        finally:
+            g._streaming = False
+
+    # The view returns before the body is written: keep the connection checked
+    # out until the generator is done with it
+    g._streaming = True
+    db, readonly = g._database, g._readonly
+
+    def release_unread():
+        # A response closed before its body is read (e.g. for HEAD) never runs
+        # generate(), so teardown never gets the connection back
+        if not started:
+            _release_connection(db, readonly)
+
+    response = Response(stream_with_context(generate()), mimetype="application/json")
+    response.call_on_close(release_unread)
+    return response
+
 # Filter projects and serves paginated results
 @app.route("/projects", methods=["GET"])
 def get_projects():
-    db = get_db()
-    cursor = db.cursor()
-
     # Get filters from request
     code = request.args.get("code")
     archived = request.args.get("archived")
     start_date = request.args.get("start_date")
     end_date = request.args.get("end_date")
+    after = request.args.get("after")
 
     # Pagination with default   
     try:
@@ -150,39 +483,104 @@ def get_projects():
     except ValueError:
         return jsonify({"error": "Invalid page or size parameter. Must be positive integers."}), 400
 
+    # Never materialize more than MAX_PAGE_SIZE rows for one request
+    size = min(size, MAX_PAGE_SIZE)
+
     offset = (page - 1) * size
-    # Base query
-    base_query = " FROM projects WHERE 1=1"
+    # Deep offsets make SQLite step over every earlier row
+    if after is None and offset > MAX_OFFSET:
+        return jsonify({"error": "Page is too deep. Use the after cursor to paginate further."}), 400
+
+    # Only check out a connection once the request is known to be valid
+    db = get_db(readonly=True)
+    cursor = db.cursor()
+    # Rows are zipped against PROJECT_COLUMNS anyway, so skip building a
+    # sqlite3.Row for each one and take plain tuples
+    cursor.row_factory = None
+
+    conditions = []
     params = []
 
     # filters
     if code:
-        base_query += " AND code LIKE ?"
+        conditions.append("code LIKE ?")
         params.append(f"%{code}%")
     
     if archived is not None:
-        base_query += " AND archived = ?"
+        conditions.append("archived = ?")
         params.append(int(archived))
 
     if start_date:
-        base_query += " AND start_date >= ?"
+        conditions.append("start_date >= ?")
         params.append(start_date)
 
     if end_date:
-        base_query += " AND end_date <= ?"
+        conditions.append("end_date <= ?")
         params.append(end_date)
 
-    # Query to get paginated results
-    query = "SELECT *" + base_query + " LIMIT ? OFFSET ?"
+    # Cursor pagination: seek past the last code already seen using the index
+    # on code, rather than scanning and discarding every earlier row. The
+    # total is left out since counting would scan the whole filter again.
+    if after is not None:
+        conditions.append("code > ?")
+        params.append(after)
+
+    # Base query, joined once; no WHERE at all when there is nothing to filter
+    base_query = " FROM projects"
+    if conditions:
+        base_query += " WHERE " + " AND ".join(conditions)
+
+    if after is not None:
+        query = "SELECT " + ", ".join(PROJECT_COLUMNS) + base_query + " ORDER BY code LIMIT ?"
+        params.append(size)
+
+        cursor.execute(query, params)
+
+        # Large pages are written out while iterating the cursor
+        if size >= STREAM_MIN_SIZE:
+            def trailer(count, last_row):
+                return {"size": count, "next_cursor": last_row[PROJECT_COLUMNS.index("code")] if count == size else None}
+
+            return _stream_projects(cursor, trailer)
+
+        projects = [dict(zip(PROJECT_COLUMNS, row)) for row in cursor.fetchall()]
+
+        return jsonify({
+            "projects": projects,
+            "size": len(projects),
+            "next_cursor": projects[-1]["code"] if len(projects) == size else None
+        })
+
+    # Query to get paginated results, with the total count of matching rows
+    # computed in the same pass by a window function
+    query = "SELECT " + ", ".join(PROJECT_COLUMNS) + ", COUNT(*) OVER() AS _total" + base_query + " LIMIT ? OFFSET ?"
     params.extend([size, offset])
 
     cursor.execute(query, params)
-    projects = [dict(zip([column[0] for column in cursor.description], row)) for row in cursor.fetchall()]
-    
-    # Query to get total count
-    count_query = "SELECT COUNT(*)" + base_query
-    cursor.execute(count_query, params[:-2])  # removing LIMIT/OFFSET
-    total_count = cursor.fetchone()[0]
+
+    def count_total(row):
+        if row is not None:
+            return row[len(PROJECT_COLUMNS)]  # _total follows the project columns
+
+        if offset:
+            # Page is past the end, so no row carried the total: count separately
+            count_query = "SELECT COUNT(*)" + base_query
+            cursor.execute(count_query, params[:-2])  # removing LIMIT/OFFSET
+            return cursor.fetchone()[0]
+
+        return 0
+
+    # Large pages are written out while iterating the cursor
+    if size >= STREAM_MIN_SIZE:
+        def trailer(count, last_row):
+            return {"total": count_total(last_row), "page": page, "size": count}
+
+        return _stream_projects(cursor, trailer)
+
+    rows = cursor.fetchall()
+    # zip stops at the last project column, leaving out _total
+    projects = [dict(zip(PROJECT_COLUMNS, row)) for row in rows]
+    total_count = count_total(rows[0] if rows else None)
 
     return jsonify({
         "projects": projects,
@@ -192,6 +590,7 @@ def get_projects():
     })
 
 @app.route("/projects/<code>", methods=["PUT"])
+@write_locked
 def update_project(code):
     data = request.get_json()
 
@@ -224,50 +623,53 @@ def update_project(code):
 
     try:
         cursor.execute(query, values)
-        db.commit()
 
         if cursor.rowcount == 0:
-            logger.warning(f"Project update failed: Code {code} not found") 
+            logger.warning("Project update failed: Code %s not found", code)
             return jsonify({"error": "Project not found"}), 404
 
-        logger.info(f"Project with code updated: {code}")  
+        _invalidate("projects")
+        logger.info("Project with code updated: %s", code)
         return jsonify({"message": "Project updated successfully"})
     
     except sqlite3.Error as e:
-        logger.error(f"Database error during project updation: {e}")
+        logger.error("Database error during project updation: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
 @app.route("/projects/<string:code>", methods=["DELETE"])
+@write_locked
 def delete_project(code):
     db = get_db()
     cursor = db.cursor()
 
     try:
-        # Check if the project is associated with any software
-        cursor.execute("SELECT 1 FROM project_software WHERE project_id = (SELECT id FROM projects WHERE code = ?)", (code,))
-        association = cursor.fetchone()
+        # Delete the project unless it is associated with any software
+        cursor.execute(DELETE_PROJECT, (code,))
+        deleted = cursor.fetchall()
 
-        if association:
-            logger.warning(f"Cannot delete project {code}: It has associated software.")
-            return jsonify({"error": "Cannot delete project. It is associated with software."}), 400
-                
-        cursor.execute("DELETE FROM projects WHERE code = ?", (code,))
-        db.commit()
+        if not deleted:
+            # Nothing deleted: find out whether the project exists at all
+            cursor.execute(SELECT_PROJECT_EXISTS, (code,))
 
-        if cursor.rowcount == 0:
-            logger.warning(f"Project deletion failed: Code {code} not found")
+            if cursor.fetchone():
+                logger.warning("Cannot delete project %s: It has associated software.", code)
+                return jsonify({"error": "Cannot delete project. It is associated with software."}), 400
+
+            logger.warning("Project deletion failed: Code %s not found", code)
             return jsonify({"error": "Project not found"}), 404
 
-        logger.info(f"Project with code deleted: {code}") 
+        _invalidate("projects")
+        logger.info("Project with code deleted: %s", code)
         return jsonify({"message": "Project deleted successfully"})
     
     except sqlite3.Error as e:
-        logger.error(f"Database error: {e}")
+        logger.error("Database error: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
     
 # CRUD APIs for Software
 @app.route("/software", methods=["POST"])
+@write_locked
 def create_software():
     data = request.get_json()
     
@@ -285,40 +687,91 @@ def create_software():
 
     try:
         cursor.execute(
-            "INSERT INTO software (name, version, vendor, deprecated) VALUES (?, ?, ?, ?)",
+            INSERT_SOFTWARE,
             (data["name"], data["version"], data["vendor"], data.get("deprecated", 0)),
         )
-        db.commit()
         
         software_id = cursor.lastrowid
-        logger.info(f"Software: {data['name']} with version: {data['version']} created (ID: {software_id})") 
+        _invalidate("software")
+        logger.info("Software: %s with version: %s created (ID: %s)", data['name'], data['version'], software_id)
         return jsonify({"message": "Software created successfully", "id": software_id}), 201
 
     except sqlite3.IntegrityError:
-        logger.warning(f"Software creation failed: Software: {data['name']} with version: {data['version']} already exists")
+        logger.warning("Software creation failed: Software: %s with version: %s already exists", data['name'], data['version'])
         return jsonify({"error": f"Software: {data['name']} with version: {data['version']} already exists"}), 400
     except sqlite3.Error as e:
-        logger.error(f"Database error during software creation: {e}")
+        logger.error("Database error during software creation: %s", e)
+        return jsonify({"error": "Internal Server Error"}), 500
+
+# Creates many software entries in one transaction
+@app.route("/software/bulk", methods=["POST"])
+@write_locked
+def create_software_bulk():
+    data = request.get_json()
+
+    if not data or not isinstance(data, list):
+        return jsonify({"error": "A list of software is required"}), 400
+
+    for index, software in enumerate(data):
+        if not isinstance(software, dict) or software.get("name") is None:
+            return jsonify({"error": "name is required", "index": index}), 400
+
+        if software.get("version") is None:
+            return jsonify({"error": "version is required", "index": index}), 400
+
+    rows = [(d["name"], d["version"], d.get("vendor"), d.get("deprecated", 0)) for d in data]
+
+    db = get_db()
+    cursor = db.cursor()
+
+    try:
+        # One savepoint for the whole batch: a single commit, and no rows kept if any fails
+        cursor.execute("SAVEPOINT bulk_insert")
+        try:
+            cursor.executemany(INSERT_SOFTWARE, rows)
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO bulk_insert")
+            raise
+        finally:
+            cursor.execute("RELEASE bulk_insert")
+
+        _invalidate("software")
+        logger.info("Software created: %s", len(rows))
+        return jsonify({"message": "Software created successfully", "count": len(rows)}), 201
+
+    except sqlite3.IntegrityError as e:
+        index = _find_duplicate(cursor, SELECT_SOFTWARE_EXISTS, [row[:2] for row in rows])
+        if index is None:
+            logger.warning("Bulk software creation failed: %s", e)
+            return jsonify({"error": "Software violates a database constraint"}), 400
+
+        name, version = rows[index][:2]
+        logger.warning("Bulk software creation failed: Software: %s with version: %s already exists", name, version)
+        return jsonify({"error": f"Software: {name} with version: {version} already exists", "index": index}), 400
+    except sqlite3.Error as e:
+        logger.error("Database error during bulk software creation: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
 
 @app.route("/software/<string:name>", methods=["GET"])
+@cached("software")
 def get_software_by_name(name):
-    logger.info(f"Searching software by name: {name}")
+    logger.debug("Searching software by name: %s", name)
 
-    db = get_db()
+    db = get_db(readonly=True)
     cursor = db.cursor()
-    
-    query = "SELECT name, version, vendor, deprecated FROM software WHERE name = ?"
 
-    cursor.execute(query, (name,))
-    software = [dict(row) for row in cursor.fetchall()]
+    cursor.execute(SELECT_SOFTWARE_BY_NAME, (name,))
+    rows = cursor.fetchall()
 
-    if software is None:
+    if not rows:
         return jsonify({"error": "Software not found"}), 404
 
+    software = [dict(row) for row in rows]
+
     return jsonify({"software": software, "total": len(software)})
 
 @app.route("/software/<string:name>/<string:version>", methods=["PUT"])
+@write_locked
 def update_software(name, version):
     data = request.get_json()
 
@@ -348,53 +801,53 @@ def update_software(name, version):
 
     try:
         cursor.execute(query, values)
-        db.commit()
 
         if cursor.rowcount == 0:
-            logger.warning(f"Software update failed: software {name} with version {version} not found") 
+            logger.warning("Software update failed: software %s with version %s not found", name, version)
             return jsonify({"error": "Software not found"}), 404
 
-        logger.info(f"Software with software {name} with version {version} updated")  
+        _invalidate("software")
+        logger.info("Software with software %s with version %s updated", name, version)
         return jsonify({"message": "Software updated successfully"})
     
     except sqlite3.Error as e:
-        logger.error(f"Database error during software updation: {e}")
+        logger.error("Database error during software updation: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
 @app.route("/software/<string:name>/<string:version>", methods=["DELETE"])
+@write_locked
 def delete_software(name, version):
     db = get_db()
     cursor = db.cursor()
 
     try:
-        # Check if the software is associated with any project
-        cursor.execute("""
-            SELECT 1 FROM project_software 
-            WHERE software_id = (SELECT id FROM software WHERE name = ? AND version = ?)
-        """, (name, version))
-        association = cursor.fetchone()
+        # Delete the software unless it is associated with any project
+        cursor.execute(DELETE_SOFTWARE, (name, version))
+        deleted = cursor.fetchall()
 
-        if association:
-            logger.warning(f"Cannot delete software {name} v{version}: It is associated with a project.")
-            return jsonify({"error": "Cannot delete software. It is associated with a project."}), 400
+        if not deleted:
+            # Nothing deleted: find out whether the software exists at all
+            cursor.execute(SELECT_SOFTWARE_EXISTS, (name, version))
 
-        cursor.execute("DELETE FROM software WHERE name = ? AND version = ?", (name, version))
-        db.commit()
+            if cursor.fetchone():
+                logger.warning("Cannot delete software %s v%s: It is associated with a project.", name, version)
+                return jsonify({"error": "Cannot delete software. It is associated with a project."}), 400
 
-        if cursor.rowcount == 0:
-            logger.warning(f"Software deletion failed: {name} v{version} not found")
+            logger.warning("Software deletion failed: %s v%s not found", name, version)
             return jsonify({"error": "Software not found"}), 404
 
-        logger.info(f"Software deleted: {name} v{version}") 
+        _invalidate("software")
+        logger.info("Software deleted: %s v%s", name, version)
         return jsonify({"message": "Software deleted successfully"})
     
     except sqlite3.Error as e:
-        logger.error(f"Database error during Software deletion: {e}")
+        logger.error("Database error during Software deletion: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
 
 # An endpoint that associates a software version with a project
 @app.route('/projects/software', methods=['POST'])
+@write_locked
 def associate_software_with_project():
     data = request.get_json()
     code = data.get('code')
@@ -402,15 +855,15 @@ def associate_software_with_project():
     version = data.get('version')
 
     if not code:
-        logging.warning(f"Missing required fields: code")
+        logger.warning("Missing required fields: code")
         return jsonify({'error': 'code is required'}), 400
 
     if not software_name:
-        logging.warning(f"Missing required fields: software_name")
+        logger.warning("Missing required fields: software_name")
         return jsonify({'error': 'software_name is required'}), 400
     
     if not version:
-        logging.warning(f"Missing required fields: version")
+        logger.warning("Missing required fields: version")
         return jsonify({'error': 'version is required'}), 400
 
     # Extract major version
@@ -420,74 +873,51 @@ def associate_software_with_project():
     cursor = db.cursor()
 
     try:
-        # Fetch project ID from project name
-        cursor.execute("SELECT id FROM projects WHERE code = ?", (code,))
-        project = cursor.fetchone()
+        # Fetch project, software and existing associations in one query
+        cursor.execute(SELECT_ASSOCIATION_STATE, (code, software_name, version, software_name, major_version))
+        state = cursor.fetchone()
 
-        if not project:
-            logging.warning(f"Project {code} not found")
+        if state['project_id'] is None:
+            logger.warning("Project %s not found", code)
             return jsonify({'error': 'Project not found'}), 404
 
-        project_id = project['id']
-
-        # Fetch software info
-        cursor.execute("SELECT id, deprecated FROM software WHERE name = ? AND version = ?", (software_name, version))
-        software = cursor.fetchone()
+        project_id = state['project_id']
 
-        if not software:
-            logging.warning(f"Software {software_name} version {version} not found")
+        if state['software_id'] is None:
+            logger.warning("Software %s version %s not found", software_name, version)
             return jsonify({'error': 'Software not found'}), 404
 
-        if software['deprecated']:
-            logging.warning(f"Attempt to associate deprecated software {software_name} version {version}")
+        if state['deprecated']:
+            logger.warning("Attempt to associate deprecated software %s version %s", software_name, version)
             return jsonify({'error': 'Cannot associate a deprecated software version'}), 400
 
         # Check if the project already has the same software version associated
-        cursor.execute("""
-            SELECT 1 
-            FROM project_software 
-            WHERE project_id = ? AND software_id = ?
-        """, (project_id, software['id']))
-
-        if cursor.fetchone():
-            logging.warning(f"Project {project_id} already has {software_name} version {version} associated")
+        if state['associated']:
+            logger.warning("Project %s already has %s version %s associated", project_id, software_name, version)
             return jsonify({'error': 'Software version already associated with the project'}), 400
 
         # Check if project already has a different major version of the software
-        cursor.execute("""
-            SELECT s.version 
-            FROM software s
-            JOIN project_software ps 
-            ON s.id = ps.software_id
-            WHERE s.deprecated = 0 AND ps.project_id = ? AND s.name = ?
-        """, (project_id, software_name))
-
-        existing_versions = cursor.fetchall()
-
-        for row in existing_versions:
-            existing_major_version = row['version'].split('.')[0]
-
-            if existing_major_version != major_version:
-                logging.warning(f"Project {project_id} already uses a different major version: {row['version']}")
-                return jsonify({'error': f'Project already uses a different major version: {row["version"]}'}), 400
+        if state['conflicting_version'] is not None:
+            logger.warning("Project %s already uses a different major version: %s", project_id, state['conflicting_version'])
+            return jsonify({'error': f'Project already uses a different major version: {state["conflicting_version"]}'}), 400
 
         # Associate software with project
-        cursor.execute("INSERT INTO project_software (project_id, software_id) VALUES (?, ?)", (project_id, software['id']))
-        db.commit()
+        cursor.execute(INSERT_PROJECT_SOFTWARE, (project_id, state['software_id']))
 
-        logging.info(f"Software {software_name} version {version} associated with project {project_id}")
+        _invalidate('projects')
+        logger.info("Software %s version %s associated with project %s", software_name, version, project_id)
         return jsonify({'message': 'Software successfully associated with project'}), 201
 
     except sqlite3.IntegrityError:
-        logger.warning(f"Project creation failed: Code {data['code']} with software {data['software_name']} and version {data['version']} already exists")
+        logger.warning("Project creation failed: Code %s with software %s and version %s already exists", data['code'], data['software_name'], data['version'])
         return jsonify({"error": f"Project with code and version already exists"}), 400
 
     except sqlite3.Error as e:
-        logging.error(f"Database error: {e}")
+        logger.error("Database error: %s", e)
         return jsonify({'error': 'Database error occurred'}), 500
 
     except Exception as e:
-        logging.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         return jsonify({'error': 'An unexpected error occurred'}), 500
 
 
@@ -25,3 +25,7 @@ CREATE TABLE IF NOT EXISTS project_software (
     FOREIGN KEY (project_id) REFERENCES projects(id),
     FOREIGN KEY (software_id) REFERENCES software(id)
 );
+
+-- The UNIQUE constraints above already index projects(code), software(name, version)
+-- and project_software(project_id, ...); lookups by software_id need their own
+CREATE INDEX IF NOT EXISTS idx_project_software_software_id ON project_software (software_id);
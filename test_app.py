@@ -1,54 +1,159 @@
 import pytest
+import io
 import os
-from app import app, get_db, init_db
+import sqlite3
+import threading
+from app import app, get_db, init_db, close_pool, _database_uri, _cache, _ro_pool, _rw_pool, CACHE_TTL, MAX_PAGE_SIZE, MEMORY_DATABASE_URI, INSERT_PROJECT, INSERT_SOFTWARE
+
+# Shared-cache in-memory database: every pooled connection sees the same data,
+# and it is discarded once the last connection to it is closed. Each xdist
+# worker gets its own named database.
+TEST_DATABASE = f"file:memdb_{os.environ.get('PYTEST_XDIST_WORKER', 'master')}?mode=memory&cache=shared"
+
+# The association most tests post, encoded once instead of on every request
+ASSOCIATE_PROJECT1 = b'{"code": "project1", "software_name": "software1", "version": "1.0.0"}'
+
+@pytest.fixture(scope="session")
+def _app():
+    """Configure the app for testing and create the schema once per session."""
+    app.testing = True  # testing mode (uses test database)
+    # Let errors go through the app's own handlers instead of re-raising them
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    app.config["TRAP_HTTP_EXCEPTIONS"] = False
+    app.config["DATABASE"] = TEST_DATABASE
+
+    init_db()  # Initialize schema in test DB
+
+    yield app
+
+    # Closing the pooled connections drops the database
+    close_pool()
+
+@pytest.fixture(scope="session")
+def _client(_app):
+    """A single test client shared by every test."""
+    return _app.test_client()
 
 @pytest.fixture
-def client():
-    """Setup a test client with an in-memory database."""
-    TEST_DB_FILE = "database/test.db"
-    app.config["TESTING"] = True  # testing mode (uses test database)
-    app.config["DATABASE"] = TEST_DB_FILE  
-
-    with app.test_client() as client:
-        with app.app_context():
-            init_db()  # Initialize schema in test DB
-        
-        yield client  # Run test
-        
-        with app.app_context():
-            db = get_db()
-            cursor = db.cursor()
-            cursor.execute("DELETE FROM project_software")  
-            cursor.execute("DELETE FROM projects")  
-            cursor.execute("DELETE FROM software")  
-            db.commit()
-            db.close()
+def client(_app, _client):
+    """Setup a test client whose changes are rolled back after the test."""
+    # Requests reuse this application context, and with it this connection,
+    # so everything a test writes stays inside the savepoint
+    with _app.app_context():
+        db = get_db()
+        db.execute("SAVEPOINT test_sp")
 
-# --------------- Test Cases for Project APIs ----------------
+        yield _client  # Run test
+
+        db.execute("ROLLBACK TO SAVEPOINT test_sp")
+        db.execute("RELEASE SAVEPOINT test_sp")
+
+@pytest.fixture
+def client_no_db(_client):
+    """The shared test client without a savepoint, for requests rejected before any SQL runs."""
+    return _client
+
+@pytest.fixture
+def seed_project(client):
+    """Insert a project straight into the test database, skipping the HTTP layer."""
+    def seed(code, archived=0, start_date=None, end_date=None):
+        get_db().execute(INSERT_PROJECT, (code, archived, start_date, end_date))
+
+    return seed
+
+@pytest.fixture
+def seed_software(client):
+    """Insert a software entry straight into the test database, skipping the HTTP layer."""
+    def seed(name, version, vendor=None, deprecated=0):
+        get_db().execute(INSERT_SOFTWARE, (name, version, vendor, deprecated))
 
-def test_create_project(client):
-    """creating a new project."""
-    response = client.post("/projects", json={"code": "mycode1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
+    return seed
 
+@pytest.fixture
+def seed_projects(client):
+    """Insert many projects with a single executemany, given (code, archived, start_date, end_date) rows."""
+    def seed(rows):
+        get_db().executemany(INSERT_PROJECT, rows)
+
+    return seed
+
+@pytest.fixture
+def seed_many(seed_projects):
+    """Insert n generated projects, feeding executemany from a generator so no row list is built."""
+    def seed(n):
+        seed_projects((f"mycode{i}", 0, None, None) for i in range(n))
+
+    return seed
+
+@pytest.fixture
+def seeded_projects(seed_projects):
+    """A mixed set of projects shared by the filter tests, inserted in one batch."""
+    seed_projects([
+        ("mycode", 1, "2024-01-01", "2024-06-30"),
+        ("mycode1", 1, "2025-02-01", "2026-01-01"),
+        ("mycode2", 0, "2025-03-01", "2025-12-31"),
+        ("myproject", 0, "2025-01-15", None),
+        ("my%$@!code", 0, "2025-02-01", "2025-02-01"),
+        ("testcode", 0, "2025-06-01", "2025-09-30"),
+    ])
+
+# --------------- Test Cases for Project APIs ----------------
+
+@pytest.mark.parametrize("existing, payload, status, message", [
+    # creating a new project
+    (None, {"code": "mycode1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"}, 201, b"Project created successfully"),
+    # creating a project with duplicate code
+    ({"code": "mycode2"}, {"code": "mycode2"}, 400, b"already exists"),
+    # project creation failure due to missing code
+    (None, {"archived": 0}, 400, b"Project code is required"),
+], ids=["created", "duplicate", "missing_code"])
+def test_create_project(client, seed_project, existing, payload, status, message):
+    """creating a project."""
+    if existing:
+        seed_project(**existing)
+
+    response = client.post("/projects", json=payload)
+    assert response.status_code == status
+    assert message in response.data
+
+def test_create_projects_bulk(client):
+    """creating several projects in one request."""
+    response = client.post("/projects/bulk", json=[{"code": "mycode1", "archived": 1}, {"code": "mycode2"}])
     assert response.status_code == 201
-    assert b"Project created successfully" in response.data
+    assert response.json["count"] == 2
+
+    response = client.get("/projects")
+    assert response.json["total"] == 2
 
-def test_create_project_duplicate(client):
-    """creating a project with duplicate code."""
-    client.post("/projects", json={"code": "mycode2"})
-    response = client.post("/projects", json={"code": "mycode2"})
+def test_create_projects_bulk_duplicate(client, seed_project):
+    """bulk creation reports the duplicate and keeps none of the batch."""
+    seed_project("mycode2")
+    response = client.post("/projects/bulk", json=[{"code": "mycode1"}, {"code": "mycode2"}])
     assert response.status_code == 400
-    assert b"already exists" in response.data
+    assert response.json == {"error": "Project with code mycode2 already exists", "index": 1}
 
-def test_create_project_missing_code(client):
-    """project creation failure due to missing code."""
-    response = client.post("/projects", json={"archived": 0})
+    response = client.get("/projects/mycode1")
+    assert response.status_code == 404
+
+def test_create_projects_bulk_missing_code(client_no_db):
+    """bulk creation failure due to missing code."""
+    response = client_no_db.post("/projects/bulk", json=[{"code": "mycode1"}, {"archived": 0}])
+    assert response.status_code == 400
+    assert response.json == {"error": "Project code is required", "index": 1}
+
+@pytest.mark.parametrize("projects, message", [
+    ([{"code": "mycode1"}, {"code": None}], "Project code is required"),
+    ([{"code": "mycode1"}, {"code": "mycode2", "archived": "yes"}], "archived must be an integer"),
+], ids=["null_code", "archived_not_integer"])
+def test_create_projects_bulk_invalid_value(client_no_db, projects, message):
+    """bulk creation rejects values the projects table cannot store, not as duplicates."""
+    response = client_no_db.post("/projects/bulk", json=projects)
     assert response.status_code == 400
-    assert b"Project code is required" in response.data
+    assert response.json == {"error": message, "index": 1}
 
-def test_get_project_by_code(client):
+def test_get_project_by_code(client, seed_project):
     """retrieving project details by code."""
-    client.post("/projects", json={"code": "mycode"})
+    seed_project("mycode")
     response = client.get("/projects/mycode")
     assert response.status_code == 200
     assert b"mycode" in response.data
@@ -59,9 +164,9 @@ def test_get_project_not_found(client):
     assert response.status_code == 404
     assert b"Project not found" in response.data
 
-def test_update_project(client):
+def test_update_project(client, seed_project):
     """updating a project."""
-    client.post("/projects", json={"code": "mycode"})
+    seed_project("mycode")
     response = client.put("/projects/mycode", json={"archived": 1})
     assert response.status_code == 200
     assert b"Project updated successfully" in response.data
@@ -72,9 +177,9 @@ def test_update_project_not_found(client):
     assert response.status_code == 404
     assert b"Project not found" in response.data
 
-def test_delete_project(client):
+def test_delete_project(client, seed_project):
     """deleting a project."""
-    client.post("/projects", json={"code": "mycode"})
+    seed_project("mycode")
     response = client.delete("/projects/mycode")
     assert response.status_code == 200
     assert b"Project deleted successfully" in response.data
@@ -85,51 +190,69 @@ def test_delete_project_not_found(client):
     assert response.status_code == 404
     assert b"Project not found" in response.data
 
-def test_delete_project_with_association(client):
+def test_delete_project_with_association(client, seed_project, seed_software):
     """Deletion of project with associated software."""
 
-    client.post("/projects", json={"code": "project1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
-    client.post("/software", json={"name": "software1", "version": "1.0.0", "vendor": "MyCompany", "deprecated": 0})
-
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
+    seed_software("software1", "1.0.0", vendor="MyCompany", deprecated=0)
 
     # Associate software with project
-    client.post("/projects/software", json=data)
+    client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
 
     # Delete the project
     response = client.delete("/projects/project1")
     assert response.status_code == 400
     assert response.json == {"error": "Cannot delete project. It is associated with software."}
 
-
 # --------------- Test Cases for Software APIs ----------------
 
-def test_create_software(client):
-    """creating a new software entry."""
-    response = client.post("/software", json={"name": "Python", "version": "3.9", "vendor": "Python", "deprecated": 0})
+@pytest.mark.parametrize("existing, payload, status, message", [
+    # creating a new software entry
+    (None, {"name": "Python", "version": "3.9", "vendor": "Python", "deprecated": 0}, 201, b"Software created successfully"),
+    # creating duplicate software entry
+    ({"name": "Java", "version": "17", "vendor": "Oracle"}, {"name": "Java", "version": "17", "vendor": "Oracle"}, 400, b"already exists"),
+    # software creation failure due to missing fields
+    (None, {"name": "NodeJS"}, 400, b"version is required"),
+], ids=["created", "duplicate", "missing_version"])
+def test_create_software(client, seed_software, existing, payload, status, message):
+    """creating a software entry."""
+    if existing:
+        seed_software(**existing)
+
+    response = client.post("/software", json=payload)
+    assert response.status_code == status
+    assert message in response.data
+
+def test_create_software_bulk(client):
+    """creating several software entries in one request."""
+    response = client.post("/software/bulk", json=[
+        {"name": "Python", "version": "3.9", "vendor": "Python"},
+        {"name": "Python", "version": "3.12", "vendor": "Python"},
+    ])
     assert response.status_code == 201
-    assert b"Software created successfully" in response.data
+    assert response.json["count"] == 2
 
-def test_create_software_duplicate(client):
-    """creating duplicate software entry."""
-    client.post("/software", json={"name": "Java", "version": "17", "vendor": "Oracle"})
-    response = client.post("/software", json={"name": "Java", "version": "17", "vendor": "Oracle"})
+    response = client.get("/software/Python")
+    assert response.json["total"] == 2
+
+def test_create_software_bulk_duplicate(client):
+    """bulk software creation with the same entry twice in the batch."""
+    response = client.post("/software/bulk", json=[
+        {"name": "Java", "version": "17", "vendor": "Oracle"},
+        {"name": "Java", "version": "17", "vendor": "Oracle"},
+    ])
     assert response.status_code == 400
-    assert b"already exists" in response.data
+    assert response.json == {"error": "Software: Java with version: 17 already exists", "index": 1}
 
-def test_create_software_missing_version(client):
-    """software creation failure due to missing fields."""
-    response = client.post("/software", json={"name": "NodeJS"})
+def test_create_software_bulk_null_version(client_no_db):
+    """bulk software creation rejects a null version, not as a duplicate."""
+    response = client_no_db.post("/software/bulk", json=[{"name": "Java", "version": None}])
     assert response.status_code == 400
-    assert b"version is required" in response.data
+    assert response.json == {"error": "version is required", "index": 0}
 
-def test_get_software_by_name(client):
+def test_get_software_by_name(client, seed_software):
     """retrieving software details by name."""
-    client.post("/software", json={"name": "Python", "version": "3.9", "vendor": "Python"})
+    seed_software("Python", "3.9", vendor="Python")
     response = client.get("/software/Python")
     assert response.status_code == 200
     assert b"Python" in response.data
@@ -137,12 +260,12 @@ def test_get_software_by_name(client):
 def test_get_software_not_found(client):
     """retrieving a software that does not exist."""
     response = client.get("/software/Rust")
-    assert response.status_code == 200  # Still returns empty list
-    assert b'{"software":[],"total":0}\n' in response.data
+    assert response.status_code == 404
+    assert response.json == {"error": "Software not found"}
 
-def test_update_software(client):
+def test_update_software(client, seed_software):
     """updating a software entry."""
-    client.post("/software", json={"name": "Python", "version": "3.9", "vendor": "Python"})
+    seed_software("Python", "3.9", vendor="Python")
     response = client.put("/software/Python/3.9", json={"deprecated": 1})
     assert response.status_code == 200
     assert b"Software updated successfully" in response.data
@@ -153,9 +276,9 @@ def test_update_software_not_found(client):
     assert response.status_code == 404
     assert b"Software not found" in response.data
 
-def test_delete_software(client):
+def test_delete_software(client, seed_software):
     """deleting a software entry."""
-    client.post("/software", json={"name": "Python", "version": "3.9", "vendor": "Python"})
+    seed_software("Python", "3.9", vendor="Python")
     response = client.delete("/software/Python/3.9")
     assert response.status_code == 200
     assert b"Software deleted successfully" in response.data
@@ -166,42 +289,32 @@ def test_delete_software_not_found(client):
     assert response.status_code == 404
     assert b"Software not found" in response.data
 
-def test_delete_software_with_association(client):
+def test_delete_software_with_association(client, seed_project, seed_software):
     """Deletion of software with associated project."""
 
-    client.post("/projects", json={"code": "project1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
-    client.post("/software", json={"name": "software1", "version": "1.0.0", "vendor": "MyCompany", "deprecated": 0})
-
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
+    seed_software("software1", "1.0.0", vendor="MyCompany", deprecated=0)
 
     # Associate software with project
-    client.post("/projects/software", json=data)
+    client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
 
     # Delete the software
     response = client.delete("/software/software1/1.0.0")
     assert response.status_code == 400
     assert response.json == {"error": "Cannot delete software. It is associated with a project."}
 
-
 # --------------- Test Cases for Project Filter API ----------------
-def test_fetch_all_projects(client):
+def test_fetch_all_projects(client, seed_project):
     """fetching all projects with default pagination."""
-    client.post("/projects", json={"code": "mycode"})
+    seed_project("mycode")
     response = client.get("/projects")
     assert response.status_code == 200
-    data = response.get_json()
-    assert "projects" in data
-    assert isinstance(data["projects"], list)
+    projects = response.get_json()["projects"]
+    assert isinstance(projects, list)
 
-def test_fetch_projects_with_pagination(client):
+def test_fetch_projects_with_pagination(client, seed_projects):
     """fetching projects with custom pagination."""
-    client.post("/projects", json={"code": "mycode"})
-    client.post("/projects", json={"code": "mycode1"})
-    client.post("/projects", json={"code": "mycode2"})
+    seed_projects([("mycode", 0, None, None), ("mycode1", 0, None, None), ("mycode2", 0, None, None)])
     response = client.get("/projects?page=2&size=2")
     assert response.status_code == 200
     data = response.get_json()
@@ -209,63 +322,85 @@ def test_fetch_projects_with_pagination(client):
     assert data["page"] == 2
     assert data["size"] <= 5
 
-def test_fetch_projects_filtered_by_code(client):
+def test_fetch_projects_total_with_pagination(client, seed_projects):
+    """total counts every matching project, not just the current page."""
+    seed_projects([("mycode", 0, None, None), ("mycode1", 0, None, None), ("mycode2", 0, None, None)])
+    response = client.get("/projects?page=1&size=2")
+    data = response.get_json()
+    assert data["total"] == 3
+    assert data["size"] == 2
+    assert all("_total" not in project for project in data["projects"])
+
+    # page past the end still reports the total
+    response = client.get("/projects?page=5&size=2")
+    data = response.get_json()
+    assert data["total"] == 3
+    assert data["projects"] == []
+
+def test_fetch_projects_with_cursor(client, seed_projects):
+    """fetching projects page by page with the after cursor."""
+    seed_projects([("mycode2", 0, None, None), ("mycode", 0, None, None), ("mycode1", 0, None, None)])
+    response = client.get("/projects?after=&size=2")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [project["code"] for project in data["projects"]] == ["mycode", "mycode1"]
+    assert data["next_cursor"] == "mycode1"
+
+    response = client.get(f"/projects?after={data['next_cursor']}&size=2")
+    data = response.get_json()
+    assert [project["code"] for project in data["projects"]] == ["mycode2"]
+    assert data["next_cursor"] is None
+
+def test_fetch_projects_filtered_by_code(client, seeded_projects):
     """fetching projects by partial code match."""
-    client.post("/projects", json={"code": "mycode"})
-    client.post("/projects", json={"code": "myproject"})
     response = client.get("/projects?code=proj")
     assert response.status_code == 200
-    data = response.get_json()
-    for project in data["projects"]:
+    projects = response.get_json()["projects"]
+    assert [project["code"] for project in projects] == ["myproject"]
+    for project in projects:
         assert "proj" in project["code"]
 
-def test_fetch_archived_projects(client):
+def test_fetch_archived_projects(client, seeded_projects):
     """fetching only archived projects."""
-    client.post("/projects", json={"code": "mycode","archived": 1})
-    client.post("/projects", json={"code": "mycode1","archived": 1})
-    client.post("/projects", json={"code": "mycode2","archived": 0})
     response = client.get("/projects?archived=1")
     assert response.status_code == 200
-    data = response.get_json()
-    for project in data["projects"]:
+    projects = response.get_json()["projects"]
+    assert len(projects) == 2
+    for project in projects:
         assert project["archived"] == 1
 
-def test_fetch_projects_by_start_date(client):
+def test_fetch_projects_by_start_date(client, seeded_projects):
     """fetching projects starting on or after a given date."""
-    client.post("/projects", json={"code": "mycode","start_date": "2024-01-01"})
-    client.post("/projects", json={"code": "mycode","start_date": "2025-02-01"})
     response = client.get("/projects?start_date=2025-01-01")
     assert response.status_code == 200
-    data = response.get_json()
-    for project in data["projects"]:
+    projects = response.get_json()["projects"]
+    assert len(projects) == 5
+    for project in projects:
         assert project["start_date"] >= "2025-01-01"
 
-def test_fetch_projects_by_end_date(client):
+def test_fetch_projects_by_end_date(client, seeded_projects):
     """fetching projects ending on or before a given date."""
-    client.post("/projects", json={"code": "mycode","end_date": "2026-01-01"})
-    client.post("/projects", json={"code": "mycode","end_date": "2025-02-01"})
     response = client.get("/projects?end_date=2025-12-31")
     assert response.status_code == 200
-    data = response.get_json()
-    for project in data["projects"]:
+    projects = response.get_json()["projects"]
+    assert len(projects) == 4
+    for project in projects:
         assert project["end_date"] is None or project["end_date"] <= "2025-12-31"
 
-def test_fetch_projects_with_invalid_page(client):
+def test_fetch_projects_with_invalid_page(client_no_db):
     """handling invalid page values."""
-    response = client.get("/projects?page=-1&size=abc")
+    response = client_no_db.get("/projects?page=-1&size=abc")
     assert response.status_code == 400
     data = response.get_json()
     assert "error" in data
     assert data["error"] == "Invalid page or size parameter. Must be positive integers."
 
-def test_fetch_projects_with_special_chars(client):
+def test_fetch_projects_with_special_chars(client, seeded_projects):
     """projects retrieval with special characters in the code."""
-    client.post("/projects", json={"code": "mycode","start_date": "2024-01-01"})
-    client.post("/projects", json={"code": "my%$@!code","start_date": "2025-02-01"})
     response = client.get("/projects?code=%$@!")
     assert response.status_code == 200
-    data = response.get_json()
-    assert isinstance(data["projects"], list)
+    projects = response.get_json()["projects"]
+    assert [project["code"] for project in projects] == ["my%$@!code"]
 
 def test_fetch_empty_database(client):
     """fetching projects when database is empty."""
@@ -275,115 +410,283 @@ def test_fetch_empty_database(client):
     assert data["total"] == 0
     assert data["projects"] == []
 
-def test_fetch_large_pagination(client):
+def test_fetch_large_pagination(client, seed_many):
     """large pagination requests."""
-    client.post("/projects", json={"code": "mycode","start_date": "2024-01-01"})
-    client.post("/projects", json={"code": "mycode2","start_date": "2025-02-01"})    
+    seed_many(1000)
+    response = client.get("/projects?size=1000")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data["projects"]) == MAX_PAGE_SIZE
+    assert data["total"] == 1000
+
+def test_fetch_large_page_streamed(client, seed_projects):
+    """large pages are streamed with the same fields as small ones."""
+    seed_projects([("mycode", 0, None, None), ("mycode2", 0, None, None)])
+    response = client.get("/projects?size=100")
+    assert response.status_code == 200
+    assert response.is_streamed
+    data = response.get_json()
+    assert sorted(project["code"] for project in data["projects"]) == ["mycode", "mycode2"]
+    assert data["total"] == 2
+    assert data["page"] == 1
+    assert data["size"] == 2
+
+    response = client.get("/projects?page=3&size=100")
+    assert response.get_json() == {"projects": [], "total": 2, "page": 3, "size": 0}
+
+    response = client.get("/projects?after=&size=100")
+    data = response.get_json()
+    assert [project["code"] for project in data["projects"]] == ["mycode", "mycode2"]
+    assert data["next_cursor"] is None
+
+def test_unread_streamed_response_returns_connection(_client):
+    """a streamed page closed before its body is read still returns its connection to the pool."""
+    idle = _ro_pool.qsize()
+    # Runs outside the client fixture, so the request checks out its own
+    # read-only connection; HEAD closes the response without reading it
+    response = _client.head("/projects?size=150", buffered=True)
+    assert response.status_code == 200
+    assert _ro_pool.qsize() == max(idle, 1)
+
+def test_fetch_projects_size_is_capped(client, seed_many):
+    """page size is clamped to the maximum."""
+    seed_many(201)
     response = client.get("/projects?size=1000")
     assert response.status_code == 200
     data = response.get_json()
-    assert len(data["projects"]) <= 1000
+    assert data["size"] == 200
+    assert data["total"] == 201
+
+def test_fetch_projects_too_deep(client_no_db):
+    """offset pagination past the maximum offset is rejected."""
+    response = client_no_db.get("/projects?page=1000&size=200")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Page is too deep. Use the after cursor to paginate further."
 
-def test_fetch_projects_with_all_filters(client):
+def test_fetch_projects_with_all_filters(client, seeded_projects):
     """applying multiple filters together."""
     response = client.get("/projects?code=test&archived=0&start_date=2025-01-01&end_date=2025-12-31&page=1&size=3")
     assert response.status_code == 200
-    data = response.get_json()
-    for project in data["projects"]:
+    projects = response.get_json()["projects"]
+    assert [project["code"] for project in projects] == ["testcode"]
+    for project in projects:
         assert "test" in project["code"]
         assert project["archived"] == 0
         assert project["start_date"] >= "2025-01-01"
         assert project["end_date"] is None or project["end_date"] <= "2025-12-31"
 
+# --------------- Test Cases for database connections ----------------
+@pytest.fixture
+def file_database(_app, monkeypatch, tmp_path):
+    """Point the app at a fresh database file, keeping the in-memory database's connections aside."""
+    # Closing every in-memory connection would drop the shared database
+    parked = []
+    for pool in (_rw_pool, _ro_pool):
+        parked.append([pool.get_nowait() for _ in range(pool.qsize())])
+
+    monkeypatch.setitem(_app.config, "DATABASE", str(tmp_path / "test.db"))
+    init_db()
+    yield
+    close_pool()
+
+    for pool, connections in zip((_rw_pool, _ro_pool), parked):
+        for db in connections:
+            pool.put_nowait(db)
+
+def test_memory_database_is_shared(_app, monkeypatch):
+    """:memory: maps to one shared in-memory database rather than a file named :memory:."""
+    monkeypatch.setitem(_app.config, "DATABASE", ":memory:")
+    assert _database_uri() == MEMORY_DATABASE_URI
+    assert _database_uri(readonly=True) == MEMORY_DATABASE_URI
+
+def test_get_uses_read_only_connection(_client, file_database):
+    """a GET checks out a read-only connection that refuses writes."""
+    response = _client.get("/projects")
+    assert response.status_code == 200
+    assert _ro_pool.qsize() == 1
+
+    db = _ro_pool.get_nowait()
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            db.execute(INSERT_PROJECT, ("mycode", 0, None, None))
+    finally:
+        _ro_pool.put_nowait(db)
+
+class _StalledBody(io.BytesIO):
+    """A request body whose reads wait until resume is set, like a client that stops sending."""
+    def __init__(self, body, resume):
+        super().__init__(body)
+        self.resume = resume
+
+    def read(self, *args):
+        self.resume.wait()
+        return super().read(*args)
+
+    def readinto(self, buffer):
+        self.resume.wait()
+        return super().readinto(buffer)
+
+def test_write_not_blocked_by_unread_body(_client):
+    """a write goes ahead while another write's request body is still being sent."""
+    resume = threading.Event()
+    body = b"{}"
+    stalled = threading.Thread(target=_client.post, args=("/projects",), kwargs={
+        "input_stream": _StalledBody(body, resume),
+        "content_length": len(body),
+        "content_type": "application/json",
+    })
+    stalled.start()
+
+    # Rejected before any SQL runs, so nothing outlives the test
+    responses = []
+    writer = threading.Thread(target=lambda: responses.append(_client.post("/projects", json={})))
+    writer.start()
+    writer.join(timeout=2)
+    finished = not writer.is_alive()
+
+    resume.set()
+    stalled.join()
+    writer.join()
+    assert finished
+    assert responses[0].status_code == 400
+
+# --------------- Test Cases for the response cache ----------------
+@pytest.fixture
+def cache_enabled(monkeypatch):
+    """Turn on the response cache, which testing mode bypasses, starting and ending empty."""
+    monkeypatch.setitem(app.config, "TESTING", False)
+    _cache.clear()
+    yield
+    _cache.clear()
+
+def test_cached_get_served_from_cache(client, seed_project, cache_enabled):
+    """a repeated GET is answered from the cache without reading the database."""
+    seed_project("mycode")
+    assert client.get("/projects/mycode").json["archived"] == 0
+
+    # Changed behind the API's back, so nothing invalidates the cache
+    get_db().execute("UPDATE projects SET archived = 1 WHERE code = 'mycode'")
+    assert client.get("/projects/mycode").json["archived"] == 0
+
+def test_cached_get_expires(client, seed_project, cache_enabled, monkeypatch):
+    """a cached response is read again once its ttl has passed."""
+    now = [1000.0]
+    monkeypatch.setattr("app._now", lambda: now[0])
+    seed_project("mycode")
+    client.get("/projects/mycode")
+    get_db().execute("UPDATE projects SET archived = 1 WHERE code = 'mycode'")
+
+    now[0] += CACHE_TTL - 1
+    assert client.get("/projects/mycode").json["archived"] == 0
+
+    now[0] += 1
+    assert client.get("/projects/mycode").json["archived"] == 1
+
+@pytest.mark.parametrize("method, path, payload, fetched, status, archived", [
+    ("put", "/projects/mycode", {"archived": 1}, "/projects/mycode", 200, 1),
+    ("delete", "/projects/mycode", None, "/projects/mycode", 404, None),
+    ("post", "/projects/bulk", [{"code": "mycode1"}], "/projects/mycode1", 200, 0),
+], ids=["put", "delete", "bulk"])
+def test_cached_get_invalidated_by_write(client, seed_project, cache_enabled, method, path, payload, fetched, status, archived):
+    """a write to the projects table drops its cached responses."""
+    seed_project("mycode")
+    client.get("/projects/mycode")
+    client.get("/projects/mycode1")
+    assert set(_cache["projects"]) == {"/projects/mycode?", "/projects/mycode1?"}
+
+    getattr(client, method)(path, json=payload)
+    assert "projects" not in _cache
+
+    response = client.get(fetched)
+    assert response.status_code == status
+    if archived is not None:
+        assert response.json["archived"] == archived
+
+def test_cached_software_invalidated_by_bulk_create(client, seed_software, cache_enabled):
+    """bulk software creation drops cached software responses."""
+    seed_software("Python", "3.9", vendor="Python")
+    assert client.get("/software/Python").json["total"] == 1
+
+    client.post("/software/bulk", json=[{"name": "Python", "version": "3.12"}])
+    assert client.get("/software/Python").json["total"] == 2
+
+def test_cache_cleared_when_full(client, cache_enabled, monkeypatch):
+    """a table's cached responses are dropped once it holds CACHE_MAX_ENTRIES of them."""
+    monkeypatch.setattr("app.CACHE_MAX_ENTRIES", 2)
+    client.get("/projects/mycode1")
+    client.get("/projects/mycode2")
+    client.get("/projects/mycode3")
+    assert list(_cache["projects"]) == ["/projects/mycode3?"]
+
 # ----------------- Test Cases for associate_software_with_project API -----------------
-def test_associate_software_with_project_success(client):
+def test_associate_software_with_project_success(client, seed_project, seed_software):
     """Associating a valid software with a project."""
     # First, create a project and software
-    client.post("/projects", json={"code": "project1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
-    client.post("/software", json={"name": "software1", "version": "1.0.0", "vendor": "MyCompany", "deprecated": 0})
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
+    seed_software("software1", "1.0.0", vendor="MyCompany", deprecated=0)
     
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
-    response = client.post("/projects/software", json=data)
+    response = client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
     assert response.status_code == 201
     assert b"Software successfully associated with project" in response.data
 
-def test_missing_code(client):
+def test_missing_code(client_no_db):
     """Missing 'code' field in request."""
     data = {
         "software_name": "software1",
         "version": "1.0.0"
     }
-    response = client.post("/projects/software", json=data)
+    response = client_no_db.post("/projects/software", json=data)
     assert response.status_code == 400
     assert response.json == {"error": "code is required"}
 
-def test_missing_software_name(client):
+def test_missing_software_name(client_no_db):
     """Missing 'software_name' field in request."""
     data = {
         "code": "project1",
         "version": "1.0.0"
     }
-    response = client.post("/projects/software", json=data)
+    response = client_no_db.post("/projects/software", json=data)
     assert response.status_code == 400
     assert response.json == {"error": "software_name is required"}
 
-def test_missing_version(client):
+def test_missing_version(client_no_db):
     """Missing 'version' field in request."""
     data = {
         "code": "project1",
         "software_name": "software1"
     }
-    response = client.post("/projects/software", json=data)
+    response = client_no_db.post("/projects/software", json=data)
     assert response.status_code == 400
     assert response.json == {"error": "version is required"}
 
 def test_project_not_found(client):
     """Project is not found."""
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
-    response = client.post("/projects/software", json=data)
+    response = client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
     assert response.status_code == 404
     assert response.json == {"error": "Project not found"}
 
-def test_software_not_found(client):
+def test_software_not_found(client, seed_project):
     """Software is not found."""
-    client.post("/projects", json={"code": "project1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
     
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
-    response = client.post("/projects/software", json=data)
+    response = client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
     assert response.status_code == 404
     assert response.json == {"error": "Software not found"}
 
-def test_deprecated_software(client):
+def test_deprecated_software(client, seed_project, seed_software):
     """Software is deprecated."""
-    client.post("/projects", json={"code": "project1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
-    client.post("/software", json={"name": "software1", "version": "1.0.0", "vendor": "MyCompany", "deprecated": 1})
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
+    seed_software("software1", "1.0.0", vendor="MyCompany", deprecated=1)
     
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
-    response = client.post("/projects/software", json=data)
+    response = client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
     assert response.status_code == 400
     assert response.json == {"error": "Cannot associate a deprecated software version"}
 
-def test_associate_with_different_major_version(client):
+def test_associate_with_different_major_version(client, seed_project, seed_software):
     """Project already has a different major version of the same software."""
-    client.post("/projects", json={"code": "project1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
-    client.post("/software", json={"name": "software1", "version": "2.0.0", "vendor": "MyCompany", "deprecated": 0})
-    client.post("/software", json={"name": "software1", "version": "1.0.0", "vendor": "MyCompany", "deprecated": 0})
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
+    seed_software("software1", "2.0.0", vendor="MyCompany", deprecated=0)
+    seed_software("software1", "1.0.0", vendor="MyCompany", deprecated=0)
 
     # Associate software version 2.0.0
     data = {
@@ -394,34 +697,35 @@ def test_associate_with_different_major_version(client):
     client.post("/projects/software", json=data)
 
     # Now, try to associate with a different major version (1.x.x)
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
-    response = client.post("/projects/software", json=data)
+    response = client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
     assert response.status_code == 400
     assert response.json == {"error": "Project already uses a different major version: 2.0.0"}
 
-def test_associate_software_with_project_duplicate_entry(client):
+def test_associate_with_same_major_version(client, seed_project, seed_software):
+    """Project can use another minor version of software it already uses."""
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
+    seed_software("software1", "1.0.0", vendor="MyCompany", deprecated=0)
+    seed_software("software1", "1.1.0", vendor="MyCompany", deprecated=0)
+
+    client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
+
+    response = client.post("/projects/software", json={"code": "project1", "software_name": "software1", "version": "1.1.0"})
+    assert response.status_code == 201
+    assert b"Software successfully associated with project" in response.data
+
+def test_associate_software_with_project_duplicate_entry(client, seed_project, seed_software):
     """A project already has the same software version associated."""
 
-    client.post("/projects", json={"code": "project1", "archived": 0, "start_date": "2025-01-01", "end_date": "2025-12-31"})
-    client.post("/software", json={"name": "software1", "version": "1.0.0", "vendor": "MyCompany", "deprecated": 0})
+    seed_project("project1", archived=0, start_date="2025-01-01", end_date="2025-12-31")
+    seed_software("software1", "1.0.0", vendor="MyCompany", deprecated=0)
 
-    data = {
-        "code": "project1",
-        "software_name": "software1",
-        "version": "1.0.0"
-    }
-    
     # First attempt to associate software
-    response = client.post("/projects/software", json=data)
+    response = client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
     assert response.status_code == 201
     assert b"Software successfully associated with project" in response.data
     
     # Now, try to associate the same software again, which should cause a duplicate error
-    response = client.post("/projects/software", json=data)
+    response = client.post("/projects/software", data=ASSOCIATE_PROJECT1, content_type="application/json")
     assert response.status_code == 400
     assert response.json == {"error": "Software version already associated with the project"}
 